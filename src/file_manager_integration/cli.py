@@ -27,10 +27,11 @@ If not, see <http://www.gnu.org/licenses/>.
 """
 
 
-import argparse
 import json
 import logging
 import pathlib
+import sys
+import types
 
 from file_manager_integration import __version__
 from file_manager_integration import dialog
@@ -55,6 +56,57 @@ SUPPORTED_FILE_MANAGERS = {
     for single_file_manager in file_managers.SUPPORTED
 }
 
+USAGE = """usage: file_manager_integration [-h] [-v] [-q] [--version]
+                                {list-supported,show-config,configure,install}
+                                ...
+"""
+
+HELP_TEXT = f"""{USAGE}
+Integrate a script in file managers
+
+subcommands:
+  list-supported        list supported file managers
+  show-config           show configuration from {JSON_FILE}
+  configure             ask confguration items and write the result
+                        to {JSON_FILE}
+  install               install the inegration in the specified file manager
+
+options:
+  -h, --help            show this help message and exit
+  -v, --verbose         output all messages including debug level
+  -q, --quiet           limit message output to warnings and errors
+  --version             print version and exit
+"""
+
+INSTALL_USAGE = f"""usage: file_manager_integration install [-h]
+    [--force-create-directories] [--force-overwrite]
+    [--force-rename-existing] [--interactive]
+    {{{",".join(SUPPORTED_FILE_MANAGERS)}}} [integration_mode]
+"""
+
+INSTALL_HELP = f"""{INSTALL_USAGE}
+options:
+  -h, --help            show this help message and exit
+  --force-create-directories
+                        create required directories if they do not exist yet
+  --force-overwrite     overwrite existing files or symbolic links
+  --force-rename-existing
+                        script integrations only: rename an existing symbolic
+                        link if it already points to the script specified
+                        in {JSON_FILE}.
+  --interactive         question all configuration items interactively
+  file_manager          the file manager to integrate the script with
+  integration_mode      the integration mode (eg. {file_managers.ACTION}
+                        or {file_managers.SCRIPT})
+"""
+
+INSTALL_OPTIONS = {
+    "--force-create-directories": "force_create_directories",
+    "--force-overwrite": "force_overwrite",
+    "--force-rename-existing": "force_rename_existing",
+    "--interactive": "interactive",
+}
+
 
 #
 # Functions
@@ -133,7 +185,8 @@ def configure(arguments):
     """Configure the JSON file"""
     current_path = pathlib.Path.cwd()
     LOGGER.heading(
-        f"Configure file manager integration in {current_path}",
+        "Configure file manager integration in %s",
+        current_path,
         style=dialog.BoxFormatter.double,
     )
     try:
@@ -188,7 +241,7 @@ def install(arguments):
         return RETURNCODE_ERROR
     #
     if not arguments.integration_mode:
-        arguments.integration_mode = file_manager.capabilities[0]
+        arguments.integration_mode = min(file_manager.capabilities)
     #
     if arguments.integration_mode not in file_manager.capabilities:
         LOGGER.error(
@@ -204,7 +257,7 @@ def install(arguments):
             arguments.integration_mode, configuration, arguments
         )
     except ValueError as error:
-        LOGGER.error(str(error))
+        LOGGER.error("%s", error)
         return RETURNCODE_ERROR
     #
     LOGGER.info(
@@ -224,7 +277,7 @@ def list_supported_file_managers(*unused_arguments):
         LOGGER.info(
             "%s (supports integration(s): %s)",
             name.title(),
-            ", ".join(fm_class.capabilities),
+            ", ".join(sorted(fm_class.capabilities)),
         )
     #
     return RETURNCODE_OK
@@ -239,110 +292,138 @@ def show_configuration(*unused_arguments):
         return RETURNCODE_ERROR
     #
     for (key, value) in configuration.items():
-        LOGGER.heading(f"{key} = {value!r}")
+        LOGGER.heading("%s = %r", key, value)
         LOGGER.debug(file_managers.HELP[key])
     #
     return RETURNCODE_OK
 
 
+def _parse_error(message, usage=USAGE):
+    """Print an error message plus usage to standard error,
+    and exit with returncode 2 like argparse does
+    """
+    sys.stderr.write(usage)
+    sys.stderr.write(f"file_manager_integration: error: {message}\n")
+    sys.exit(2)
+
+
+def _parse_install_arguments(remaining_arguments, arguments):
+    """Parse options and positional arguments
+    of the install subcommand into the arguments namespace
+    """
+    for attribute in INSTALL_OPTIONS.values():
+        setattr(arguments, attribute, False)
+    #
+    arguments.integration_mode = None
+    positionals = []
+    for argument in remaining_arguments:
+        if argument in ("-h", "--help"):
+            print(INSTALL_HELP)
+            sys.exit(RETURNCODE_OK)
+        #
+        try:
+            setattr(arguments, INSTALL_OPTIONS[argument], True)
+        except KeyError:
+            if argument.startswith("-"):
+                _parse_error(
+                    f"unrecognized arguments: {argument}",
+                    usage=INSTALL_USAGE,
+                )
+            #
+            positionals.append(argument)
+        #
+    #
+    if not positionals:
+        _parse_error(
+            "the following arguments are required: file_manager",
+            usage=INSTALL_USAGE,
+        )
+    #
+    if len(positionals) > 2:
+        _parse_error(
+            f"unrecognized arguments: {' '.join(positionals[2:])}",
+            usage=INSTALL_USAGE,
+        )
+    #
+    if positionals[0] not in SUPPORTED_FILE_MANAGERS:
+        choices = ", ".join(repr(name) for name in SUPPORTED_FILE_MANAGERS)
+        _parse_error(
+            f"argument file_manager: invalid choice: {positionals[0]!r}"
+            f" (choose from {choices})",
+            usage=INSTALL_USAGE,
+        )
+    #
+    arguments.file_manager = positionals[0]
+    if len(positionals) > 1:
+        arguments.integration_mode = positionals[1]
+    #
+
+
+def _get_arguments():
+    """Parse command line arguments by hand;
+    the fixed and tiny grammar of this script
+    does not justify the import and setup cost of argparse
+    """
+    subcommands = {
+        "list-supported": list_supported_file_managers,
+        "show-config": show_configuration,
+        "configure": configure,
+        "install": install,
+    }
+    arguments = types.SimpleNamespace(loglevel=logging.INFO, version=False)
+    remaining_arguments = sys.argv[1:]
+    while remaining_arguments:
+        argument = remaining_arguments.pop(0)
+        if argument in ("-h", "--help"):
+            print(HELP_TEXT)
+            sys.exit(RETURNCODE_OK)
+        #
+        if argument in ("-v", "--verbose"):
+            arguments.loglevel = logging.DEBUG
+        elif argument in ("-q", "--quiet"):
+            arguments.loglevel = logging.WARNING
+        elif argument == "--version":
+            arguments.version = True
+        else:
+            try:
+                arguments.execute_function = subcommands[argument]
+            except KeyError:
+                _parse_error(f"invalid choice: {argument!r}")
+            #
+            if argument == "install":
+                _parse_install_arguments(remaining_arguments, arguments)
+            elif remaining_arguments:
+                _parse_error(
+                    "unrecognized arguments:"
+                    f" {' '.join(remaining_arguments)}"
+                )
+            #
+            break
+        #
+    #
+    return arguments
+
+
 def main():
     """Parse command line arguments and execute the matching function"""
-    main_parser = argparse.ArgumentParser(
-        prog="file_manager_integration",
-        description="Integrate a script in file managers",
-    )
-    main_parser.set_defaults(loglevel=logging.INFO)
-    main_parser.add_argument(
-        "-v",
-        "--verbose",
-        action="store_const",
-        const=logging.DEBUG,
-        dest="loglevel",
-        help="output all messages including debug level",
-    )
-    main_parser.add_argument(
-        "-q",
-        "--quiet",
-        action="store_const",
-        const=logging.WARNING,
-        dest="loglevel",
-        help="limit message output to warnings and errors",
-    )
-    main_parser.add_argument(
-        "--version",
-        action="store_true",
-        help="print version and exit",
-    )
-    subparsers = main_parser.add_subparsers()
-    # Parser for the "list-supported" command
-    parser_list_supported = subparsers.add_parser(
-        "list-supported", help="list supported file managers"
-    )
-    parser_list_supported.set_defaults(
-        execute_function=list_supported_file_managers
-    )
-    # Parser for the "show-config" command
-    parser_show_config = subparsers.add_parser(
-        "show-config", help=f"show configuration from {JSON_FILE}"
-    )
-    parser_show_config.set_defaults(execute_function=show_configuration)
-    # Parser for the "configure" command
-    parser_configure = subparsers.add_parser(
-        "configure",
-        help=f"ask confguration items and write the result to {JSON_FILE}",
-    )
-    parser_configure.set_defaults(execute_function=configure)
-    # Parser for the "configure" command
-    parser_install = subparsers.add_parser(
-        "install", help="install the inegration in the specified file manager"
-    )
-    parser_install.set_defaults(execute_function=install)
-    parser_install.add_argument(
-        "--force-create-directories",
-        action="store_true",
-        help="create required directories if they do not exist yet",
-    )
-    parser_install.add_argument(
-        "--force-overwrite",
-        action="store_true",
-        help="overwrite existing files or symbolic links",
-    )
-    parser_install.add_argument(
-        "--force-rename-existing",
-        action="store_true",
-        help="script integrations only: rename an existing symbolic link"
-        f" if it already points to the script specified in {JSON_FILE}.",
-    )
-    parser_install.add_argument(
-        "--interactive",
-        action="store_true",
-        help="question all configuration items interactively",
-    )
-    parser_install.add_argument(
-        "file_manager",
-        choices=SUPPORTED_FILE_MANAGERS.keys(),
-        help="the file manager to integrate the script with",
-    )
-    parser_install.add_argument(
-        "integration_mode",
-        nargs="?",
-        help=f"the integration mode (eg. {file_managers.ACTION}"
-        f" or {file_managers.SCRIPT})",
-    )
+    if sys.argv[1:] == ["--version"]:
+        # Fast path: print the version without even
+        # building the argument parser
+        print(__version__)
+        return RETURNCODE_OK
     #
-    arguments = main_parser.parse_args()
+    arguments = _get_arguments()
     if arguments.version:
         print(__version__)
         return RETURNCODE_OK
     #
     LOGGER.configure(level=arguments.loglevel)
-    try:
-        return arguments.execute_function(arguments)
-    except AttributeError:
+    if not hasattr(arguments, "execute_function"):
         LOGGER.error("Please specify --version or a subcommand:")
-        main_parser.print_help()
+        print(HELP_TEXT)
+        return RETURNCODE_ERROR
     #
-    return RETURNCODE_ERROR
+    return arguments.execute_function(arguments)
 
 
 # vim: fileencoding=utf-8 ts=4 sts=4 sw=4 autoindent expandtab syntax=python:
@@ -133,7 +133,7 @@ def formatted_message(msg, *args):
     if args:
         if (
             len(args) == 1
-            and isinstance(args[0], collections.Mapping)
+            and isinstance(args[0], collections.abc.Mapping)
             and args[0]
         ):
             args = args[0]
@@ -386,10 +386,28 @@ class WrappedTextLogger:
         """Exit with an error message unconditionally"""
         self._exit(message, *args, returncode=returncode)
 
-    def configure(self, **kwargs):
-        """Configure logging"""
-        kwargs.setdefault("format", self.message_format)
-        logging.basicConfig(**kwargs)
+    def configure(self, level=logging.WARNING, **kwargs):
+        """Configure logging by attaching a pre-built handler
+        to the root logger directly,
+        bypassing the indirections of logging.basicConfig().
+        Like logging.basicConfig(), do nothing but set the level
+        if the root logger already has handlers.
+        Unsupported keyword arguments raise a TypeError
+        instead of being silently dropped.
+        """
+        message_format = kwargs.pop("format", self.message_format)
+        if kwargs:
+            raise TypeError(
+                f"Unsupported keyword argument(s): {', '.join(kwargs)}"
+            )
+        #
+        root_logger = logging.getLogger()
+        if not root_logger.handlers:
+            handler = logging.StreamHandler()
+            handler.setFormatter(logging.Formatter(message_format))
+            root_logger.addHandler(handler)
+        #
+        root_logger.setLevel(level)
 
 
 class Interrogator:
@@ -438,7 +456,7 @@ class Interrogator:
         """
         preset_answer = kwargs.pop("preset_answer", None)
         args = list(args)
-        if len(args) == 1 and isinstance(args[0], collections.Mapping):
+        if len(args) == 1 and isinstance(args[0], collections.abc.Mapping):
             args[0]["preset_answer"] = preset_answer
             placeholder = "%(preset_answer)r"
         else:
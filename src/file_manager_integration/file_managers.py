@@ -31,7 +31,7 @@ import os
 import logging
 import pathlib
 import string
-import subprocess
+import types
 
 
 #
@@ -42,6 +42,8 @@ import subprocess
 ACTION = "action"
 SCRIPT = "script"
 
+HOME = pathlib.Path.home()
+
 SCRIPT_REQUIRED_KEYS = {"name", "absolute_path"}
 
 NEMO_ACTION_TEMPLATE = """[Nemo Action]
@@ -80,18 +82,21 @@ Exec=${absolute_path} %F
 Name=${name}
 """
 
-HELP = dict(
-    name="The desired name of the menu entry",
-    comment="Comment for the action (Nemo, …)",
-    nemo_icon_name="Icon name for Nemo",
-    caja_icon_name="Icon name for Caja",
-    absolute_path="Absolute path of the script to integrate",
-    relative_path="Relative path of the script to integrate",
-    extensions="Semicolon-separated list of handled file extensions"
-    " (Nemo, …)",
-    mimetypes="Semicolon-separated list of handled file mime types"
-    " (Dolphin, …)",
-    identifier="Internal identifier in the desktop file (Caja, Dolphin, …)",
+HELP = types.MappingProxyType(
+    dict(
+        name="The desired name of the menu entry",
+        comment="Comment for the action (Nemo, …)",
+        nemo_icon_name="Icon name for Nemo",
+        caja_icon_name="Icon name for Caja",
+        absolute_path="Absolute path of the script to integrate",
+        relative_path="Relative path of the script to integrate",
+        extensions="Semicolon-separated list of handled file extensions"
+        " (Nemo, …)",
+        mimetypes="Semicolon-separated list of handled file mime types"
+        " (Dolphin, …)",
+        identifier="Internal identifier in the desktop file"
+        " (Caja, Dolphin, …)",
+    )
 )
 
 
@@ -129,22 +134,6 @@ def check_target_file(target_file_path, options):
     #
 
 
-def check_target_symlink(target_link_path, options):
-    """Check if the target symlink already exists.
-    If it does, is a symbolic link,
-    and the --force-overwrite option was set,
-    delete it.
-    """
-    if target_link_path.exists():
-        if target_link_path.is_symlink() and options.force_overwrite:
-            target_link_path.unlink()
-            return
-        #
-        raise ValueError(f"{target_link_path} already exists!")
-        #
-    #
-
-
 #
 # Classes
 #
@@ -154,17 +143,59 @@ class EnhancedTemplate(string.Template):
 
     """string.Template subclass aware of the required keys"""
 
-    @property
-    def required_keys(self):
-        """Return the set of keys required by the template"""
-        keys = set()
+    def __init__(self, template):
+        """Pre-split the template into a sequence of
+        (literal text, key or None) parts,
+        and precompute the set of required keys
+        """
+        super().__init__(template)
+        parts = []
+        position = 0
         for match_obj in self.pattern.finditer(self.template):
+            if match_obj.start() > position:
+                parts.append((self.template[position:match_obj.start()], None))
+            #
+            position = match_obj.end()
             named = match_obj.group("named") or match_obj.group("braced")
             if named is not None:
-                keys.add(named)
+                parts.append((match_obj.group(), named))
+            elif match_obj.group("escaped") is not None:
+                parts.append((self.delimiter, None))
+            else:
+                parts.append((match_obj.group(), None))
+            #
+        #
+        if position < len(self.template):
+            parts.append((self.template[position:], None))
+        #
+        self.parts = tuple(parts)
+        self.required_keys = frozenset(
+            key for (literal, key) in self.parts if key is not None
+        )
+
+    def safe_substitute(self, mapping=None, **kws):
+        """Substitute using the precompiled parts sequence,
+        keeping unmatched placeholders verbatim
+        like string.Template.safe_substitute() does
+        """
+        if mapping is None:
+            mapping = kws
+        elif kws:
+            mapping = {**mapping, **kws}
+        #
+        output = []
+        for (literal, key) in self.parts:
+            if key is None:
+                output.append(literal)
+            else:
+                try:
+                    output.append(str(mapping[key]))
+                except KeyError:
+                    output.append(literal)
+                #
             #
         #
-        return keys
+        return "".join(output)
 
 
 class BaseFileManager:
@@ -175,14 +206,42 @@ class BaseFileManager:
     config_directory = ".local/share/unknown-file-manager"
     subdirs = {ACTION: "actions", SCRIPT: "scripts"}
     explicit_directories = {}
-    capabilities = ()
+    capabilities = frozenset()
     action_template = ""
-    executable = "/bin/false"
+    # Empty by design: file managers without a known executable path
+    # must never report themselves as installed.
+    executable = ""
+
+    @classmethod
+    def _init_class_attributes(cls):
+        """Precompute derived class attributes:
+        the template, the configuration path,
+        and the target directory per supported integration mode
+        """
+        cls.template = EnhancedTemplate(cls.action_template)
+        cls.config_path = HOME / cls.config_directory
+        target_directories = {}
+        for integration_mode in cls.capabilities:
+            try:
+                explicit_subpath = cls.explicit_directories[integration_mode]
+            except KeyError:
+                target_directories[integration_mode] = (
+                    cls.config_path / cls.subdirs[integration_mode]
+                )
+            else:
+                target_directories[integration_mode] = HOME / explicit_subpath
+            #
+        #
+        cls.target_directories = target_directories
+
+    def __init_subclass__(cls, **kwargs):
+        """Precompute derived attributes once per subclass"""
+        super().__init_subclass__(**kwargs)
+        cls._init_class_attributes()
 
     def __init__(self):
         """Initialize attributes"""
-        self.template = EnhancedTemplate(self.action_template)
-        self.config_path = pathlib.Path.home() / self.config_directory
+        self._installed = None
 
     def check_availability(self):
         """Check installation"""
@@ -203,15 +262,7 @@ class BaseFileManager:
             )
         #
         self.check_availability()
-        try:
-            explicit_subpath = self.explicit_directories[integration_mode]
-        except KeyError:
-            target_directory_path = (
-                self.config_path / self.subdirs[integration_mode]
-            )
-        else:
-            target_directory_path = pathlib.Path.home() / explicit_subpath
-        #
+        target_directory_path = self.target_directories[integration_mode]
         try:
             install_method = getattr(self, f"install_{integration_mode}")
         except AttributeError as error:
@@ -222,18 +273,18 @@ class BaseFileManager:
         install_method(target_directory_path, configuration, options)
 
     def is_installed(self):
-        """Check if the file manager is installed"""
-        try:
-            subprocess.run(
-                (self.executable, "--version"),
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL,
-                check=True,
+        """Check if the file manager is installed.
+        Always False without a defined executable path.
+        The result of the first probe is cached per instance.
+        """
+        if self._installed is None:
+            self._installed = (
+                bool(self.executable)
+                and os.path.isfile(self.executable)
+                and os.access(self.executable, os.X_OK)
             )
-        except subprocess.CalledProcessError:
-            return False
         #
-        return True
+        return self._installed
 
     def get_required_keys(self, integration_mode):
         """Return the required keys for the integration_mode"""
@@ -243,14 +294,35 @@ class BaseFileManager:
         return self.template.required_keys
 
 
+# __init_subclass__ does not run for the base class itself
+BaseFileManager._init_class_attributes()
+
+
 class Nautilus(BaseFileManager):
 
     """Nautilus file manager, also a base class for others"""
 
     name = "nautilus"
     config_directory = ".local/share/nautilus"
-    capabilities = (SCRIPT,)
+    capabilities = frozenset((SCRIPT,))
     executable = "/usr/bin/nautilus"
+    action_file_suffix = ".desktop"
+
+    def install_action(self, target_directory_path, configuration, options):
+        """Install as file manager action in target path,
+        using the class-cached template
+        and the action_file_suffix class attribute.
+        Only effective in subclasses with the "action" capability.
+        """
+        check_target_directory(target_directory_path, options)
+        target_file_path = target_directory_path / (
+            configuration["name"] + self.action_file_suffix
+        )
+        check_target_file(target_file_path, options)
+        target_file_path.write_text(
+            self.template.safe_substitute(configuration),
+            encoding="utf-8",
+        )
 
     @staticmethod
     def install_script(target_directory_path, configuration, options):
@@ -265,25 +337,52 @@ class Nautilus(BaseFileManager):
         if not source_path.is_file():
             raise ValueError(f"{source_path} does not exist!")
         #
-        target_link_path = target_directory_path / configuration["name"]
+        link_name = configuration["name"]
+        target_link_path = target_directory_path / link_name
         logging.debug("Target path: %s", target_link_path)
-        check_target_symlink(target_link_path, options)
-        for single_path in target_directory_path.glob("*"):
-            if single_path.is_symlink():
-                if single_path.readlink() == source_path:
-                    if options.force_rename_existing:
-                        os.rename(single_path, target_link_path)
-                        return
+        if options.force_rename_existing:
+            # Only the rename option requires knowledge of the
+            # directory contents; scan it in a single pass,
+            # recording findings only, and decide afterwards so the
+            # outcome does not depend on the directory read order.
+            source_str = os.fspath(source_path)
+            existing_target_is_symlink = False
+            target_exists = False
+            rename_candidate = None
+            with os.scandir(target_directory_path) as dir_entries:
+                for entry in dir_entries:
+                    if entry.name == link_name:
+                        target_exists = True
+                        existing_target_is_symlink = entry.is_symlink()
+                    elif (
+                        entry.is_symlink()
+                        and os.readlink(entry.path) == source_str
+                    ):
+                        rename_candidate = entry.path
                     #
-                    logging.warning(
-                        "Found the source script already linked as %s,"
-                        " but ignoring the situation.",
-                        single_path,
-                    )
                 #
             #
+            if target_exists:
+                if existing_target_is_symlink and options.force_overwrite:
+                    os.unlink(target_link_path)
+                else:
+                    raise ValueError(f"{target_link_path} already exists!")
+                #
+            #
+            if rename_candidate is not None:
+                os.rename(rename_candidate, target_link_path)
+                return
+            #
+        elif options.force_overwrite and target_link_path.is_symlink():
+            target_link_path.unlink()
+        #
+        try:
+            os.symlink(source_path, target_link_path)
+        except FileExistsError as error:
+            raise ValueError(
+                f"{target_link_path} already exists!"
+            ) from error
         #
-        os.symlink(source_path, target_link_path)
 
 
 class Caja(Nautilus):
@@ -292,22 +391,11 @@ class Caja(Nautilus):
 
     name = "caja"
     config_directory = ".config/caja"
-    capabilities = (ACTION, SCRIPT)
+    capabilities = frozenset((ACTION, SCRIPT))
     explicit_directories = {ACTION: ".local/share/file-manager/actions"}
     action_template = CAJA_ACTION_TEMPLATE
     executable = "/usr/bin/caja"
 
-    def install_action(self, target_directory_path, configuration, options):
-        """Install as Nemo action in target path"""
-        check_target_directory(target_directory_path, options)
-        action_name = configuration["name"]
-        target_file_path = target_directory_path / f"{action_name}.desktop"
-        check_target_file(target_file_path, options)
-        target_file_path.write_text(
-            self.template.safe_substitute(configuration),
-            encoding="utf-8",
-        )
-
 
 class Nemo(Nautilus):
 
@@ -315,20 +403,10 @@ class Nemo(Nautilus):
 
     name = "nemo"
     config_directory = ".local/share/nemo"
-    capabilities = (ACTION, SCRIPT)
+    capabilities = frozenset((ACTION, SCRIPT))
     action_template = NEMO_ACTION_TEMPLATE
     executable = "/usr/bin/nemo"
-
-    def install_action(self, target_directory_path, configuration, options):
-        """Install as Nemo action in target path"""
-        check_target_directory(target_directory_path, options)
-        action_name = configuration["name"]
-        target_file_path = target_directory_path / f"{action_name}.nemo_action"
-        check_target_file(target_file_path, options)
-        target_file_path.write_text(
-            self.template.safe_substitute(configuration),
-            encoding="utf-8",
-        )
+    action_file_suffix = ".nemo_action"
 
 
 class KdefileManager(BaseFileManager):
@@ -336,7 +414,7 @@ class KdefileManager(BaseFileManager):
     """KDE file manager"""
 
     name = "dolphin"
-    capabilities = (ACTION,)
+    capabilities = frozenset((ACTION,))
     action_template = KFM_ACTION_TEMPLATE
 
 
@@ -345,7 +423,7 @@ class PcManFm(BaseFileManager):
     """PCManFM file manager"""
 
     name = "pcmanfm"
-    capabilities = (ACTION,)
+    capabilities = frozenset((ACTION,))
 
 
 class Thunar(BaseFileManager):
@@ -353,7 +431,7 @@ class Thunar(BaseFileManager):
     """Thunar file manager"""
 
     name = "thunar"
-    capabilities = (ACTION,)
+    capabilities = frozenset((ACTION,))
 
 
 #